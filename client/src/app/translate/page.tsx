@@ -17,42 +17,84 @@ const Translate: React.FC = () => {
       return;
     }
 
+    // Hex-encoded SHA-256 of the file, used by the server to deduplicate uploads
+    const fileBuffer = await file.arrayBuffer();
+    const hashBuffer = await crypto.subtle.digest('SHA-256', fileBuffer);
+    const fileHash = Array.from(new Uint8Array(hashBuffer))
+      .map(b => b.toString(16).padStart(2, '0'))
+      .join('');
+
     // Establish WebSocket connection upon form submission
     const socket = io('http://localhost:5000', {
       transports: ['websocket'],
       reconnection: false
     });
 
-    socket.on('connect', () => {
-      console.log('Connected to the server');
+    const readChunk = (blob: Blob) => new Promise<string>((resolve, reject) => {
+      const reader = new FileReader();
+      reader.onload = (e) => {
+        if(e.target?.result && typeof(e.target.result) == 'string') {
+          resolve(e.target.result.split(',')[1]);
+        } else { reject(new Error("File not in expected format.")) }
+      };
+      reader.onerror = () => reject(reader.error);
+      reader.readAsDataURL(blob);
+    });
+
+    const uploadFile = async () => {
       const CHUNK_SIZE = 1024 * 512; // 0.5MB
       const totalChunks = Math.ceil(file.size / CHUNK_SIZE);
       const fileId = `${file.name}-${Date.now()}`; // Unique ID for the file upload
 
+      // Chunks are sent in order so the server can hash them as they arrive.
+      // Each one waits for the server's ack; the last ack only comes back once
+      // the file is stored, so generate_pdfs can't overtake the upload.
       for (let i = 0; i < totalChunks; i++) {
         const blob = file.slice(i * CHUNK_SIZE, (i + 1) * CHUNK_SIZE);
-        const reader = new FileReader();
-        reader.onload = (e) => {
-          if(e.target?.result && typeof(e.target.result) == 'string') {
-            const base64Content = e.target?.result?.split(',')[1];
-            socket.emit('file_chunk', {
-              fileId: fileId,
-              chunkIndex: i,
-              totalChunks: totalChunks,
-              chunkData: base64Content,
-              fileName: file.name
-            });
-          } else { console.log("File not in expected format.") }
-        };
-        reader.readAsDataURL(blob);
+        const chunkData = await readChunk(blob);
+        const ack = await new Promise<{ stored?: boolean, error?: string }>(resolve => {
+          socket.emit('file_chunk', {
+            fileId: fileId,
+            chunkIndex: i,
+            totalChunks: totalChunks,
+            chunkData,
+            fileName: file.name,
+            fileHash
+          }, resolve);
+        });
+        if (ack.error) {
+          throw new Error(`Upload failed: ${ack.error}`);
+        }
       }
-      socket.emit('generate_pdfs', {
-        sourceLanguage,
-        sourceCurrency,
-        destinationLanguage,
-        destinationCurrency,
-        fileName: file.name,
-        fileId
+    };
+
+    socket.on('connect', () => {
+      console.log('Connected to the server');
+      // Only send the file if the server does not already have it
+      socket.emit('check_file', { fileHash, fileName: file.name }, async (data: { exists: boolean, error?: string }) => {
+        if (data.error) {
+          console.log(`File check failed: ${data.error}`);
+          socket.disconnect();
+          return;
+        } else if (data.exists) {
+          console.log('File already on server, skipping upload');
+        } else {
+          try {
+            await uploadFile();
+          } catch (err) {
+            console.log(err);
+            socket.disconnect();
+            return;
+          }
+        }
+        socket.emit('generate_pdfs', {
+          sourceLanguage,
+          sourceCurrency,
+          destinationLanguage,
+          destinationCurrency,
+          fileName: file.name,
+          fileHash
+        });
       });
     });
 
@@ -67,6 +109,16 @@ const Translate: React.FC = () => {
       console.log("Finished receiving file");
     });
 
+    socket.on('file_error', (data: { error: string }) => {
+      console.log(`File error: ${data.error}`);
+      socket.disconnect();
+    });
+
+    socket.on('job_error', (data: { error: string }) => {
+      console.log(`Job failed: ${data.error}`);
+      socket.disconnect();
+    });
+
     socket.on('job_finished', (data) => {
       console.log(`Job finished: ${JSON.stringify(data)}`);
       socket.off('job_finished')
@@ -13,16 +13,22 @@ from borb.pdf.canvas.layout.page_layout.multi_column_layout import MultiColumnLa
 from borb.pdf.canvas.layout.image.image import Image
 from borb.pdf.canvas.color.color import HexColor, X11Color
 from borb.pdf.canvas.font.simple_font.true_type_font import TrueTypeFont
+from borb.pdf.canvas.font.font import Font
+from borb.pdf.canvas.font.glyph_line import GlyphLine
+from borb.pdf.canvas.geometry.rectangle import Rectangle
+from bidi.algorithm import get_display
+from functools import lru_cache
+import typing
 import pandas as pd
 from pathlib import Path
 import numpy as np
 from datetime import date
-from decimal import Decimal
+from decimal import Decimal, ROUND_CEILING
 
 PAD: int = 2
 FONT = "Helvetica"
 FONT_SIZE: int = 10
-
+RTL_LANGUAGES = {"ar"}
 
 
 # delimits text - needed to split lines when they exceed table column width
@@ -31,6 +37,141 @@ def _delimit_text(text: str, delimiter: str, n: int) -> str:
     return delimiter.join([text[i : i + n] for i in range(0, len(text), n)])
 
 
+# loads a font once - parsing the TrueType file is slow
+@lru_cache(maxsize=None)
+def _load_font(fontPath: Path) -> Font:
+
+    return TrueTypeFont.true_type_font_from_file(fontPath)
+
+
+# borb fonts hash on their dictionary keys only, so similar fonts collide and fall back to a deep
+# comparison - the caches below key on the font's identity instead, keeping it alive while cached
+class _FontKey:
+
+    def __init__(self, font: Font):
+        self.font = font
+
+    def __hash__(self) -> int:
+        return id(self.font)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, _FontKey) and self.font is other.font
+
+
+@lru_cache(maxsize=4096)
+def _cached_text_width(text: str, key: _FontKey, font_size: Decimal) -> Decimal:
+
+    return GlyphLine.from_str(text, key.font, font_size).get_width_in_text_space()
+
+
+# measures the width of a word, cached per (font, text, font size)
+def _text_width(text: str, font: Font, font_size: Decimal) -> Decimal:
+
+    return _cached_text_width(text, _FontKey(font), font_size)
+
+
+# splits a word that is wider than the line into pieces that fit, by character
+def _break_word(
+    word: str, key: _FontKey, font_size: Decimal, width: Decimal
+) -> typing.List[str]:
+
+    pieces, piece, piece_width = [], "", Decimal(0)
+    for character in word:
+        character_width = _cached_text_width(character, key, font_size)
+        if character_width > width:
+            raise ValueError(f"'{character}' does not fit in a line of width {width}")
+        if piece and piece_width + character_width > width:
+            pieces.append(piece)
+            piece, piece_width = "", Decimal(0)
+        piece += character
+        piece_width += character_width
+    pieces.append(piece)
+    return pieces
+
+
+@lru_cache(maxsize=1024)
+def _cached_layout_rtl(
+    text: str, key: _FontKey, font_size: Decimal, width: Decimal
+) -> typing.Tuple[str, ...]:
+
+    space_width = _cached_text_width(" ", key, font_size)
+    lines, line, line_width = [], [], Decimal(0)
+    for word in text.split():
+        word_width = _cached_text_width(word, key, font_size)
+        if word_width > width:
+            # hard-break words that can't fit on any line, rather than overflow into the next cell
+            if line:
+                lines.append(" ".join(line))
+                line, line_width = [], Decimal(0)
+            *pieces, word = _break_word(word, key, font_size, width)
+            lines.extend(pieces)
+            word_width = _cached_text_width(word, key, font_size)
+        if line and line_width + space_width + word_width > width:
+            lines.append(" ".join(line))
+            line, line_width = [], Decimal(0)
+        line_width += (space_width if line else 0) + word_width
+        line.append(word)
+    lines.append(" ".join(line))
+
+    return tuple(get_display(line) for line in lines)
+
+
+# breaks RTL text into lines that fit the width in logical order, then reorders each line for display
+def _layout_rtl(
+    text: str, font: Font, font_size: Decimal, width: Decimal
+) -> typing.Tuple[str, ...]:
+
+    return _cached_layout_rtl(text, _FontKey(font), font_size, width)
+
+
+# paragraph whose lines come from _layout_rtl instead of borb's line splitter
+class _RTLParagraph(Paragraph):
+
+    def _split_text(self, bounding_box: Rectangle) -> typing.List[str]:
+
+        # borb paints into a box exactly as wide as the widest line, so round up - never down
+        width = bounding_box.get_width().quantize(Decimal("0.01"), rounding=ROUND_CEILING)
+        return list(_layout_rtl(self._text, self._font, self._font_size, width))
+
+
+# swaps left and right alignment for mirrored layouts
+def _mirror(alignment: Alignment) -> Alignment:
+
+    if alignment == Alignment.LEFT:
+        return Alignment.RIGHT
+    if alignment == Alignment.RIGHT:
+        return Alignment.LEFT
+    return alignment
+
+
+# builds a paragraph, laying out and mirroring it for RTL languages
+def _paragraph(
+    text: str,
+    language: str = "en",
+    horizontal_alignment: Alignment = Alignment.LEFT,
+    **kwargs,
+) -> Paragraph:
+
+    if language in RTL_LANGUAGES:
+        return _RTLParagraph(
+            text,
+            font=FONT,
+            horizontal_alignment=_mirror(horizontal_alignment),
+            text_alignment=Alignment.RIGHT,
+            **kwargs,
+        )
+    return Paragraph(
+        text, font=FONT, horizontal_alignment=horizontal_alignment, **kwargs
+    )
+
+
+# adds a row of cells to a table, mirrored for RTL languages
+def _add_row(table: Table, cells: list, language: str = "en") -> None:
+
+    for cell in reversed(cells) if language in RTL_LANGUAGES else cells:
+        table.add(cell)
+
+
 # translates text
 def _translate(text: str = "", language: str = "en") -> str:
 
@@ -67,48 +208,66 @@ def _build_company_info(df: pd.DataFrame, language: str = "en") -> Table:
     num_rows: int = 5 - (not CompanyEmail) - (not CompanyWebsite)
     table_001 = Table(number_of_rows=num_rows, number_of_columns=3)
 
-    table_001.add(Paragraph(_translate(CompanyStreet, language), font=FONT))
-
-    table_001.add(
-        Paragraph(
-            _translate("Date:", language),
-            font=FONT,
-            horizontal_alignment=Alignment.RIGHT,
-        )
-    )
-    table_001.add(
-        Paragraph("%d/%d/%d" % (InvoiceDate.month, InvoiceDate.day, InvoiceDate.year), font=FONT)
+    _add_row(
+        table_001,
+        [
+            _paragraph(_translate(CompanyStreet, language), language),
+            _paragraph(
+                _translate("Date:", language),
+                language,
+                horizontal_alignment=Alignment.RIGHT,
+            ),
+            _paragraph(
+                "%d/%d/%d" % (InvoiceDate.month, InvoiceDate.day, InvoiceDate.year),
+                language,
+            ),
+        ],
+        language,
     )
 
-    table_001.add(Paragraph(_translate(CompanyRegion, language), font=FONT))
-    table_001.add(
-        Paragraph(
-            _translate("Invoice Number:", language),
-            font=FONT,
-            horizontal_alignment=Alignment.RIGHT,
-        )
+    _add_row(
+        table_001,
+        [
+            _paragraph(_translate(CompanyRegion, language), language),
+            _paragraph(
+                _translate("Invoice Number:", language),
+                language,
+                horizontal_alignment=Alignment.RIGHT,
+            ),
+            _paragraph(InvoiceNumber, language),
+        ],
+        language,
     )
-    table_001.add(Paragraph(InvoiceNumber, font=FONT))
 
-    table_001.add(Paragraph(CompanyPhone, font=FONT))
-    table_001.add(
-        Paragraph(
-            _translate("Due Date:", language),
-            font=FONT,
-            horizontal_alignment=Alignment.RIGHT,
-        )
+    _add_row(
+        table_001,
+        [
+            _paragraph(CompanyPhone, language),
+            _paragraph(
+                _translate("Due Date:", language),
+                language,
+                horizontal_alignment=Alignment.RIGHT,
+            ),
+            _paragraph(
+                "%d/%d/%d" % (DueDate.month, DueDate.day, DueDate.year), language
+            ),
+        ],
+        language,
     )
-    table_001.add(Paragraph("%d/%d/%d" % (DueDate.month, DueDate.day, DueDate.year), font=FONT))
 
     if CompanyEmail:
-        table_001.add(Paragraph(CompanyEmail, font=FONT))
-        table_001.add(Paragraph(" "))
-        table_001.add(Paragraph(" "))
+        _add_row(
+            table_001,
+            [_paragraph(CompanyEmail, language), Paragraph(" "), Paragraph(" ")],
+            language,
+        )
 
     if CompanyWebsite:
-        table_001.add(Paragraph(CompanyWebsite, font=FONT))
-        table_001.add(Paragraph(" "))
-        table_001.add(Paragraph(" "))
+        _add_row(
+            table_001,
+            [_paragraph(CompanyWebsite, language), Paragraph(" "), Paragraph(" ")],
+            language,
+        )
 
     table_001.set_padding_on_all_cells(
         Decimal(PAD), Decimal(PAD), Decimal(0), Decimal(PAD)
@@ -130,16 +289,23 @@ def _build_billing_and_shipping(df: pd.DataFrame, language: str = "en") -> Table
     ShipToPhone = df.loc[0]["ShipToPhone"]
 
     table_001 = Table(number_of_rows=5, number_of_columns=2)
-    table_001.add(Paragraph(_translate("Bill To:", language), font=FONT))
-    table_001.add(Paragraph(_translate("Ship To:", language), font=FONT))
-    table_001.add(Paragraph(_translate(str(BillToName), language), font=FONT))  # BILLING
-    table_001.add(Paragraph(_translate(str(ShipToName), language), font=FONT))  # SHIPPING
-    table_001.add(Paragraph(_translate(str(BillToStreet), language), font=FONT))  # BILLING
-    table_001.add(Paragraph(_translate(str(ShipToStreet), language), font=FONT))  # SHIPPING
-    table_001.add(Paragraph(_translate(str(BillToRegion), language), font=FONT))  # BILLING
-    table_001.add(Paragraph(_translate(str(ShipToRegion), language), font=FONT))  # SHIPPING
-    table_001.add(Paragraph(str(BillToPhone), font=FONT))  # BILLING
-    table_001.add(Paragraph(str(ShipToPhone), font=FONT))  # SHIPPING
+
+    # each row holds the BILLING value followed by the SHIPPING value
+    for billing, shipping in [
+        (_translate("Bill To:", language), _translate("Ship To:", language)),
+        (_translate(str(BillToName), language), _translate(str(ShipToName), language)),
+        (_translate(str(BillToStreet), language), _translate(str(ShipToStreet), language)),
+        (_translate(str(BillToRegion), language), _translate(str(ShipToRegion), language)),
+        (str(BillToPhone), str(ShipToPhone)),
+    ]:
+        _add_row(
+            table_001,
+            [
+                _paragraph(billing, language),
+                _paragraph(shipping, language),
+            ],
+            language,
+        )
 
     table_001.set_padding_on_all_cells(
         Decimal(PAD), Decimal(PAD), Decimal(0), Decimal(PAD)
@@ -151,105 +317,90 @@ def _build_billing_and_shipping(df: pd.DataFrame, language: str = "en") -> Table
 # build itemized table
 def _build_itemized(group: pd.DataFrame, language: str = "en") -> Table:
 
+    column_widths = [
+        Decimal(4),
+        Decimal(2),
+        Decimal(2.5),
+        Decimal(2.5),
+        Decimal(2),
+        Decimal(2.5),
+        Decimal(2.5),
+    ]
+    if language in RTL_LANGUAGES:
+        column_widths.reverse()
+
     table_001 = Table(
         number_of_rows=group.shape[0] + 2,
         number_of_columns=7,
-        column_widths=[
-            Decimal(4),
-            Decimal(2),
-            Decimal(2.5),
-            Decimal(2.5),
-            Decimal(2),
-            Decimal(2.5),
-            Decimal(2.5),
-        ],
+        column_widths=column_widths,
     )
-    for h in [
-        "Product Description",
-        "Quantity",
-        "Product Price",
-        "Exempt",
-        "Tax Rate",
-        "Tax Amount",
-        "Total Price",
-    ]:
-        table_001.add(
+    _add_row(
+        table_001,
+        [
             TableCell(
-                Paragraph(
+                _paragraph(
                     _translate(h, language),
-                    font=FONT,
+                    language,
                     font_size=FONT_SIZE,
                     font_color=X11Color("White"),
                 ),
                 background_color=HexColor("14396b"),
             )
-        )
+            for h in [
+                "Product Description",
+                "Quantity",
+                "Product Price",
+                "Exempt",
+                "Tax Rate",
+                "Tax Amount",
+                "Total Price",
+            ]
+        ],
+        language,
+    )
     odd_color = HexColor("BBBBBB")
     even_color = HexColor("FFFFFF")
     for index, row in group.iterrows():
         c = even_color if index % 2 == 0 else odd_color
-        table_001.add(
-            TableCell(
-                Paragraph(
-                    _translate(str(row["Product"]), language), font=FONT, font_size=FONT_SIZE
-                ),
-                background_color=c,
-            )
+        _add_row(
+            table_001,
+            [
+                TableCell(
+                    _paragraph(text, language, font_size=FONT_SIZE),
+                    background_color=c,
+                )
+                for text in [
+                    _translate(str(row["Product"]), language),
+                    _translate(str(row["Quantity"]), language),
+                    "$ " + str(row["UnitPrice"]),
+                    "$ " + str(row["Exempt"]),
+                    str(row["TaxRate"] * 100) + " %",
+                    "$ " + str(row["TaxAmount"]),
+                    "$ " + str(row["Total"]),
+                ]
+            ],
+            language,
         )
-        table_001.add(
+    _add_row(
+        table_001,
+        [
             TableCell(
-                Paragraph(
-                    _translate(str(row["Quantity"]), language), font=FONT, font_size=FONT_SIZE
+                _paragraph(
+                    _translate("Total", language),
+                    language,
+                    horizontal_alignment=Alignment.RIGHT,
                 ),
-                background_color=c,
-            )
-        )
-        table_001.add(
-            TableCell(
-                Paragraph("$ " + str(row["UnitPrice"]), font=FONT, font_size=FONT_SIZE),
-                background_color=c,
-            )
-        )
-        table_001.add(
-            TableCell(
-                Paragraph("$ " + str(row["Exempt"]), font=FONT, font_size=FONT_SIZE),
-                background_color=c,
-            )
-        )
-        table_001.add(
-            TableCell(
-                Paragraph(str(row["TaxRate"] * 100) + " %", font=FONT, font_size=FONT_SIZE),
-                background_color=c,
-            )
-        )
-        table_001.add(
-            TableCell(
-                Paragraph("$ " + str(row["TaxAmount"]), font=FONT, font_size=FONT_SIZE),
-                background_color=c,
-            )
-        )
-        table_001.add(
+                column_span=6,
+            ),
             TableCell(
-                Paragraph("$ " + str(row["Total"]), font=FONT, font_size=FONT_SIZE),
-                background_color=c,
-            )
-        )
-    table_001.add(
-        TableCell(
-            Paragraph(
-                _translate("Total", language),
-                font=FONT,
-                horizontal_alignment=Alignment.RIGHT,
+                _paragraph(
+                    "$ " + str(group["Total"].sum()),
+                    language,
+                    horizontal_alignment=Alignment.RIGHT,
+                )
             ),
-            column_span=6,
-        )
-    )
-    table_001.add(
-        TableCell(
-            Paragraph(
-                "$ " + str(group["Total"].sum()), font=FONT, horizontal_alignment=Alignment.RIGHT
-            )
-        )
+        ],
+        language,
     )
 
     table_001.set_padding_on_all_cells(
@@ -489,7 +640,7 @@ def generate_invoice(**kwargs):
 
         df["Language"] = languages[kwargs["language"]]
         fontPath = fonts[kwargs["language"]]
-        FONT = TrueTypeFont.true_type_font_from_file(fontPath)
+        FONT = _load_font(fontPath)
 
     except KeyError as e:
         print(f"Error renaming columns: {e}")
@@ -41,10 +41,14 @@ from flask import Flask, request, jsonify, send_file
 from flask_socketio import SocketIO, emit
 from flask_cors import CORS
 import threading
+import tempfile
+import hashlib
 import os
+import re
 import base64
 
 app = Flask(__name__)
+app.config['UPLOAD_FOLDER'] = 'uploads'
 CORS(app, origins=["http://localhost:3000"])
 socketio = SocketIO(app, cors_allowed_origins="*")
 
@@ -56,8 +60,56 @@ def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-file_chunks = {}
-
+# Client-supplied hashes end up in file paths and job keys, so only accept
+# hex-encoded SHA-256 digests
+FILE_HASH_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+def valid_file_hash(file_hash):
+    return isinstance(file_hash, str) and FILE_HASH_PATTERN.fullmatch(file_hash) is not None
+
+# Uploads are stored content-addressed as uploads/<sha256><ext>, so the same
+# file uploaded twice (by any client, in any session) is only stored once.
+# The extension is kept because the invoice reader dispatches on it.
+def upload_path(file_hash, file_name):
+    extension = os.path.splitext(os.path.basename(file_name))[1].lower()
+    return os.path.join(app.config['UPLOAD_FOLDER'], file_hash + extension)
+
+# Moves a fully written temporary upload into its content-addressed location,
+# discarding it if an identical file is already stored
+def store_upload(tmp_path, file_hash, file_name):
+    path = upload_path(file_hash, file_name)
+    if os.path.exists(path):
+        os.remove(tmp_path)
+    else:
+        os.replace(tmp_path, path)
+    return path
+
+# In-flight chunked uploads, keyed by (session id, file id). Chunks are hashed
+# and written to a temporary file as soon as they can be consumed in order;
+# out-of-order chunks wait in "pending" until the gap is filled.
+# file_uploads_lock only guards the dict; each upload has its own lock for
+# hashing and writing, so uploads don't wait on each other's disk writes.
+file_uploads = {}
+file_uploads_lock = threading.Lock()
+
+# Discards an upload and its temporary file - the caller holds upload["lock"]
+def drop_upload(upload_key, upload):
+    upload["done"] = True
+    with file_uploads_lock:
+        file_uploads.pop(upload_key, None)
+    upload["file"].close()
+    os.remove(upload["file"].name)
+
+@socketio.on("check_file")
+def handle_check_file(data):
+    # Lets the client skip sending a file the server already has
+    if not valid_file_hash(data["fileHash"]):
+        return {"exists": False, "error": "Invalid file hash"}
+    path = upload_path(data["fileHash"], data["fileName"])
+    return {"exists": os.path.exists(path)}
+
+# The return value is sent back as the chunk's acknowledgement; the client
+# waits for the final one, which is only sent once the file is stored
 @socketio.on("file_chunk")
 def handle_file_chunk(data):
     # Extracting the chunk data
@@ -65,45 +117,91 @@ def handle_file_chunk(data):
     chunk_index = data["chunkIndex"]
     total_chunks = data["totalChunks"]
     chunk_data = base64.b64decode(data["chunkData"])
-    file_name = data["fileName"]  # Consider sanitizing this
-
-    # Initialize the file's chunk list if not already
-    if file_id not in file_chunks:
-        file_chunks[file_id] = [None] * total_chunks
-
-    # Store the chunk data
-    file_chunks[file_id][chunk_index] = chunk_data
-
-    # Check if all chunks have been received
-    if all(chunk is not None for chunk in file_chunks[file_id]):
-        upload_path = "uploads"
-        if not os.path.exists(upload_path):
-            os.makedirs(upload_path)
-
-        # Sanitize the file_name or ensure it's safe before appending it to the path
-        safe_file_name = os.path.join(upload_path, os.path.basename(file_name))
-
-        # Reassemble the file
-        with open(safe_file_name, "wb") as file:
-            for chunk in file_chunks[file_id]:
-                file.write(chunk)
-
-        print(f"Received and reassembled {safe_file_name}")
-
-        # Cleanup: remove stored chunks to free memory
-        del file_chunks[file_id]
+    file_name = os.path.basename(data["fileName"])
+
+    upload_key = (request.sid, file_id)
+
+    if not isinstance(total_chunks, int) or total_chunks < 1:
+        emit('file_error', {'error': f'Invalid chunk count for {file_name}'})
+        return {'error': 'Invalid chunk count'}
+
+    with file_uploads_lock:
+        # Start a new upload if this is the first chunk we see for it
+        if upload_key not in file_uploads:
+            os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+            tmp_file = tempfile.NamedTemporaryFile(
+                dir=app.config['UPLOAD_FOLDER'], suffix=".part", delete=False
+            )
+            file_uploads[upload_key] = {
+                "file": tmp_file,
+                "hash": hashlib.sha256(),
+                "total_chunks": total_chunks,
+                "next_index": 0,
+                "pending": {},
+                "lock": threading.Lock(),
+                "done": False,
+            }
+        upload = file_uploads[upload_key]
+
+    with upload["lock"]:
+        if upload["done"]:
+            return {'error': 'Upload was cancelled'}
+
+        # Reject chunks that could never complete the upload
+        if (
+            total_chunks != upload["total_chunks"]
+            or not isinstance(chunk_index, int)
+            or not 0 <= chunk_index < total_chunks
+            or chunk_index < upload["next_index"]
+            or chunk_index in upload["pending"]
+        ):
+            drop_upload(upload_key, upload)
+            emit('file_error', {'error': f'Invalid chunk {chunk_index} for {file_name}'})
+            return {'error': 'Invalid chunk'}
+
+        upload["pending"][chunk_index] = chunk_data
+
+        # Hash and write every chunk that is now contiguous
+        while upload["next_index"] in upload["pending"]:
+            chunk = upload["pending"].pop(upload["next_index"])
+            upload["hash"].update(chunk)
+            upload["file"].write(chunk)
+            upload["next_index"] += 1
+
+        # Check if all chunks have been received
+        if upload["next_index"] != total_chunks:
+            return {'stored': False}
+        upload["done"] = True
+        with file_uploads_lock:
+            del file_uploads[upload_key]
+
+    upload["file"].close()
+    file_hash = upload["hash"].hexdigest()
+
+    if "fileHash" in data and data["fileHash"] != file_hash:
+        os.remove(upload["file"].name)
+        emit('file_error', {'error': f'Hash mismatch for {file_name}'})
+        return {'error': 'Hash mismatch'}
+
+    path = store_upload(upload["file"].name, file_hash, file_name)
+    print(f"Received and reassembled {file_name} as {path}")
+    emit('file_received', {'filename': file_name, 'fileHash': file_hash, 'message': 'File uploaded successfully!'})
+    return {'stored': True, 'fileHash': file_hash}
 
 @socketio.on('send_file')
 def handle_file_send(data):
     print(data)
     file_data = data['file_data']  # Assuming base64 encoded or byte array
-    filename = data['filename']
+    filename = os.path.basename(data['filename'])
     if allowed_file(filename):
         try:
             os.makedirs(app.config['UPLOAD_FOLDER'],exist_ok=True)
-            with open(os.path.join(app.config['UPLOAD_FOLDER'],filename), 'wb') as f:
-                f.write(file_data)
-            emit('file_received', {'filename': filename, 'message': 'File uploaded successfully!'})
+            file_hash = hashlib.sha256(file_data).hexdigest()
+            if not os.path.exists(upload_path(file_hash, filename)):
+                with tempfile.NamedTemporaryFile(dir=app.config['UPLOAD_FOLDER'], suffix=".part", delete=False) as f:
+                    f.write(file_data)
+                store_upload(f.name, file_hash, filename)
+            emit('file_received', {'filename': filename, 'fileHash': file_hash, 'message': 'File uploaded successfully!'})
         except Exception as e:
             emit('file_error', {'error': str(e)})
     else:
@@ -122,9 +220,27 @@ def handle_disconnect():
     print(f"Client disconnected: {request.sid}")
     if request.sid in connected_users:
         del connected_users[request.sid]
+
+    # Drop any uploads the client did not finish
+    with file_uploads_lock:
+        unfinished = [(key, upload) for key, upload in file_uploads.items() if key[0] == request.sid]
+    for upload_key, upload in unfinished:
+        with upload["lock"]:
+            if not upload["done"]:
+                drop_upload(upload_key, upload)
+
+    with pdf_jobs_lock:
+        for job in pdf_jobs.values():
+            job["sids"].discard(request.sid)
     print(f"Clients: {connected_users}")
 
-def handle_pdf_generation(request_sid, fileName):
+# Running PDF jobs, keyed by (file hash, destination language, destination
+# currency). Identical concurrent requests subscribe to the running job instead
+# of starting another render; late subscribers are sent the PDFs already made.
+pdf_jobs = {}
+pdf_jobs_lock = threading.Lock()
+
+def handle_pdf_generation(job_key, fileName):
     print(fileName)
     # Simulate busy work and generate placeholder PDF URLs
     placeholder_urls = [
@@ -133,17 +249,32 @@ def handle_pdf_generation(request_sid, fileName):
         "http://example.com/pdf3.pdf",
     ]
 
-    for idx, url in enumerate(placeholder_urls):
-        # Using time.sleep or thread.sleep screws up socketio async event loop, use socketio.sleep() instead
-        socketio.sleep(2)  # Simulate time taken to generate each PDF
-        # Emit 'pdf_ready' event with URL, only to the client that made the request
-        # socketio.emit("pdf_ready", {"url": url}, to=request_sid)
-        socketio.emit("pdf_ready", {"url": url}, to=request_sid)
-        print(f"sent pdf {idx+1} to client {request_sid}")
-
-    # After all PDFs are "generated", notify the client that the job is finished
-    socketio.emit("job_finished", {"message": "All PDFs generated."}, to=request_sid)
-    print(f"finished sending pdfs to {request_sid}")
+    error = None
+    try:
+        for idx, url in enumerate(placeholder_urls):
+            # Using time.sleep or thread.sleep screws up socketio async event loop, use socketio.sleep() instead
+            socketio.sleep(2)  # Simulate time taken to generate each PDF
+            with pdf_jobs_lock:
+                pdf_jobs[job_key]["urls"].append(url)
+                request_sids = list(pdf_jobs[job_key]["sids"])
+            # Emit 'pdf_ready' event with URL, only to the clients waiting on this job
+            for request_sid in request_sids:
+                socketio.emit("pdf_ready", {"url": url}, to=request_sid)
+            print(f"sent pdf {idx+1} to clients {request_sids}")
+    except Exception as e:
+        error = e
+        print(f"PDF generation failed for {fileName}: {e}")
+    finally:
+        # Always retire the job, so later identical requests start a new one
+        # instead of joining one that will never finish
+        with pdf_jobs_lock:
+            request_sids = list(pdf_jobs.pop(job_key)["sids"])
+        for request_sid in request_sids:
+            if error is None:
+                socketio.emit("job_finished", {"message": "All PDFs generated."}, to=request_sid)
+            else:
+                socketio.emit("job_error", {"error": str(error)}, to=request_sid)
+        print(f"finished sending pdfs to {request_sids}")
 
 
 @socketio.on("generate_pdfs")
@@ -154,15 +285,33 @@ def handle_generate_pdfs(data):
     print(f"Destination Language: {data['destinationLanguage']},")
     print(f"Destination Currency: {data['destinationCurrency']}")
     print(f"File Name: {data['fileName']}")
-    print(f"File ID: {data['fileId']}")
+    print(f"File Hash: {data['fileHash']}")
     print("======================================================\n\n")
     print("Received request to generate PDFs:", data)
+
+    if not valid_file_hash(data['fileHash']):
+        emit('file_error', {'error': 'Invalid file hash'})
+        return
+    if not os.path.exists(upload_path(data['fileHash'], data['fileName'])):
+        emit('file_error', {'error': f"{data['fileName']} has not been uploaded"})
+        return
+
+    job_key = (data['fileHash'], data['destinationLanguage'], data['destinationCurrency'])
+    with pdf_jobs_lock:
+        if job_key in pdf_jobs:
+            # Join the running job, catching up on PDFs it already produced
+            pdf_jobs[job_key]["sids"].add(request.sid)
+            for url in pdf_jobs[job_key]["urls"]:
+                emit("pdf_ready", {"url": url})
+            print(f"Joined running job for {data['fileName']}")
+            return
+        pdf_jobs[job_key] = {"sids": {request.sid}, "urls": []}
+
     # Start the PDF generation process in a separate thread to avoid blocking
-    # Pass the client's session ID to target messages to the right client
-    threading.Thread(target=handle_pdf_generation, args=(request.sid, data['fileName'])).start()
+    # Messages are targeted at every client subscribed to the job
+    threading.Thread(target=handle_pdf_generation, args=(job_key, data['fileName'])).start()
     # handle_pdf_generation(request.sid)
 
 
 if __name__ == "__main__":
-    app.config['UPLOAD_FOLDER'] = 'uploads'
     socketio.run(app, debug=True)
@@ -0,0 +1,92 @@
+from decimal import Decimal
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import InvoiceGenerator
+from InvoiceGenerator import _add_row, _build_itemized, _layout_rtl, _load_font, _text_width
+
+NASTALIQ = (
+    Path(__file__).parent
+    / "fontpackage/Noto_Nastaliq_Urdu/NotoNastaliqUrdu-VariableFont_wght.ttf"
+)
+
+
+@pytest.fixture
+def font(monkeypatch):
+    font = _load_font(NASTALIQ)
+    monkeypatch.setattr(InvoiceGenerator, "FONT", font)
+    return font
+
+
+def test_layout_rtl_reorders_each_line_for_display(font):
+    assert _layout_rtl("سلام عليكم", font, 10, Decimal(1000)) == ("مكيلع مالس",)
+    assert _layout_rtl("رقم 445", font, 10, Decimal(1000)) == ("445 مقر",)
+
+
+def test_layout_rtl_breaks_lines_to_fit_width(font):
+    width = _text_width("one", font, 10) + _text_width(" ", font, 10) + _text_width("two", font, 10)
+    assert _layout_rtl("one two three", font, 10, width) == ("one two", "three")
+    assert _layout_rtl("one two three", font, 10, width - 1) == ("one", "two", "three")
+
+
+def test_layout_rtl_hard_breaks_words_wider_than_the_line(font):
+    word = "Supercalifragilisticexpialidocious"
+    width = Decimal(40)
+
+    lines = _layout_rtl("a " + word + " b", font, 10, width)
+
+    assert lines[0] == "a"
+    assert "".join(lines).replace(" ", "") == "a" + word + "b"
+    assert all(_text_width(line, font, 10) <= width for line in lines)
+
+
+def test_layout_rtl_rejects_characters_wider_than_the_line(font):
+    with pytest.raises(ValueError):
+        _layout_rtl("W", font, 10, Decimal(1))
+
+
+class Row(list):
+    add = list.append
+
+
+def test_add_row_mirrors_cells_for_rtl():
+    ltr, rtl = Row(), Row()
+    _add_row(ltr, [1, 2, 3], "en")
+    _add_row(rtl, [1, 2, 3], "ar")
+    assert ltr == [1, 2, 3]
+    assert rtl == [3, 2, 1]
+
+
+def test_itemized_table_is_mirrored_for_rtl(font, monkeypatch):
+    class Table(Row):
+        def __init__(self, number_of_rows, number_of_columns, column_widths):
+            self.column_widths = column_widths
+
+        def set_padding_on_all_cells(self, *padding):
+            pass
+
+    monkeypatch.setattr(InvoiceGenerator, "Table", Table)
+    monkeypatch.setattr(InvoiceGenerator, "_translate", lambda text, language="en": text)
+    group = pd.DataFrame(
+        {
+            "Product": ["Widget"],
+            "Quantity": [1],
+            "UnitPrice": [3],
+            "Exempt": [0],
+            "TaxRate": [0.05],
+            "TaxAmount": [0.15],
+            "Total": [3.15],
+        }
+    )
+
+    ltr = _build_itemized(group, "en")
+    rtl = _build_itemized(group, "ar")
+
+    assert rtl.column_widths == ltr.column_widths[::-1]
+    # header, one item and the total row
+    assert len(rtl) == len(ltr) == 7 + 7 + 2
+    # the total row puts the sum first, then the label spanning six columns
+    assert [cell.get_column_span() for cell in ltr[-2:]] == [6, 1]
+    assert [cell.get_column_span() for cell in rtl[-2:]] == [1, 6]
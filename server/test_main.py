@@ -0,0 +1,161 @@
+import base64
+import hashlib
+import os
+
+import pytest
+
+import main
+
+DATA = b"InvoiceNumber,Product\n1,Widget\n" * 100
+DATA_HASH = hashlib.sha256(DATA).hexdigest()
+
+
+@pytest.fixture(autouse=True)
+def upload_folder(tmp_path, monkeypatch):
+    monkeypatch.setitem(main.app.config, "UPLOAD_FOLDER", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def client():
+    client = main.socketio.test_client(main.app)
+    yield client
+    client.disconnect()
+
+
+def send_chunk(client, index, total_chunks, chunk, file_id="f", file_hash=DATA_HASH):
+    return client.emit(
+        "file_chunk",
+        {
+            "fileId": file_id,
+            "chunkIndex": index,
+            "totalChunks": total_chunks,
+            "chunkData": base64.b64encode(chunk).decode(),
+            "fileName": "invoices.csv",
+            "fileHash": file_hash,
+        },
+        callback=True,
+    )
+
+
+def upload(client, data, order=None, file_hash=DATA_HASH, size=500):
+    chunks = [data[i : i + size] for i in range(0, len(data), size)]
+    return [
+        send_chunk(client, i, len(chunks), chunks[i], file_hash=file_hash)
+        for i in (order if order is not None else range(len(chunks)))
+    ]
+
+
+def received(client, name):
+    return [event["args"][0] for event in client.get_received() if event["name"] == name]
+
+
+def generate(client, file_hash=DATA_HASH):
+    client.emit(
+        "generate_pdfs",
+        {
+            "sourceLanguage": "english",
+            "sourceCurrency": "USD",
+            "destinationLanguage": "arabic",
+            "destinationCurrency": "AED",
+            "fileName": "invoices.csv",
+            "fileHash": file_hash,
+        },
+    )
+
+
+def test_valid_file_hash():
+    assert main.valid_file_hash(DATA_HASH)
+    assert not main.valid_file_hash(DATA_HASH.upper())
+    assert not main.valid_file_hash("../../etc/passwd")
+    assert not main.valid_file_hash(None)
+
+
+def test_identical_uploads_are_stored_once(client, upload_folder):
+    other = main.socketio.test_client(main.app)
+    assert upload(client, DATA)[-1] == {"stored": True, "fileHash": DATA_HASH}
+    assert upload(other, DATA)[-1] == {"stored": True, "fileHash": DATA_HASH}
+    other.disconnect()
+
+    assert os.listdir(upload_folder) == [DATA_HASH + ".csv"]
+    assert client.emit(
+        "check_file", {"fileHash": DATA_HASH, "fileName": "invoices.csv"}, callback=True
+    ) == {"exists": True}
+
+
+def test_out_of_order_chunks_are_hashed_in_order(client, upload_folder):
+    acks = upload(client, DATA, order=reversed(range(4)), size=len(DATA) // 4 + 1)
+
+    assert acks[:-1] == [{"stored": False}] * 3
+    assert acks[-1] == {"stored": True, "fileHash": DATA_HASH}
+    assert (upload_folder / (DATA_HASH + ".csv")).read_bytes() == DATA
+
+
+def test_hash_mismatch_is_rejected(client, upload_folder):
+    acks = upload(client, DATA, file_hash="0" * 64)
+
+    assert acks[-1] == {"error": "Hash mismatch"}
+    assert received(client, "file_error")
+    assert os.listdir(upload_folder) == []
+
+
+def test_changed_chunk_count_drops_upload(client, upload_folder):
+    assert send_chunk(client, 0, 3, DATA[:10]) == {"stored": False}
+    assert send_chunk(client, 1, 2, DATA[10:20]) == {"error": "Invalid chunk"}
+    assert main.file_uploads == {}
+    assert os.listdir(upload_folder) == []
+
+
+@pytest.mark.parametrize("index", [-1, 2, 0])
+def test_invalid_chunk_index_drops_upload(client, upload_folder, index):
+    assert send_chunk(client, 0, 2, DATA[:10]) == {"stored": False}
+    assert send_chunk(client, index, 2, DATA[10:20]) == {"error": "Invalid chunk"}
+    assert received(client, "file_error")
+    assert main.file_uploads == {}
+    assert os.listdir(upload_folder) == []
+
+
+def test_generate_pdfs_requires_stored_file(client, monkeypatch):
+    started = []
+    monkeypatch.setattr(main.threading, "Thread", lambda **kwargs: started.append(kwargs))
+
+    generate(client)
+    generate(client, file_hash="../../etc/passwd")
+
+    assert len(received(client, "file_error")) == 2
+    assert started == []
+
+
+def test_identical_jobs_are_coalesced(client, monkeypatch):
+    class Thread:
+        def __init__(self, target, args):
+            started.append(args)
+
+        def start(self):
+            pass
+
+    started = []
+    monkeypatch.setattr(main.threading, "Thread", Thread)
+    upload(client, DATA)
+    other = main.socketio.test_client(main.app)
+    job_key = (DATA_HASH, "arabic", "AED")
+
+    generate(client)
+    main.pdf_jobs[job_key]["urls"].append("http://example.com/pdf1.pdf")
+    generate(other)
+
+    # the second request joins the running job and catches up on its PDFs
+    assert len(started) == 1
+    assert received(other, "pdf_ready") == [{"url": "http://example.com/pdf1.pdf"}]
+
+    # a failing render still retires the job and tells every subscriber
+    def fail(seconds):
+        raise RuntimeError("render failed")
+
+    monkeypatch.setattr(main.socketio, "sleep", fail)
+    main.handle_pdf_generation(job_key, "invoices.csv")
+
+    assert job_key not in main.pdf_jobs
+    assert received(client, "job_error") == [{"error": "render failed"}]
+    assert received(other, "job_error") == [{"error": "render failed"}]
+    other.disconnect()